@@ -1,20 +1,23 @@
 import sys
 import os
-import glob
+import json
+import tempfile
+from pathlib import Path
 from colorama import Fore, Style
 import numpy as np
 import warnings
 import pandas as pd
 import geopandas as gp
+from pyproj import CRS
 from tqdm import tqdm
 from tabulate import tabulate
-from itertools import permutations
 import re
 from datetime import datetime, timedelta
 
 import matplotlib.pyplot as plt
-from shapely.geometry import Point, LineString
+import shapely
 from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection
 import matplotlib.dates as mdates
 
 try:
@@ -27,10 +30,39 @@ except ModuleNotFoundError:
     raise ModuleNotFoundError(
         f"Module 'dss_python' not found. \n"
         f'  → Please install via command "pip install dss_python" in terminal.')
+
+# Excel reader: the (much faster) calamine engine if 'python-calamine' is installed and pandas supports it (pandas >= 2.2)
+try:
+    import python_calamine
+    EXCEL_ENGINE = "calamine" if tuple(int(v) for v in pd.__version__.split(".")[:2]) >= (2, 2) else "openpyxl"
+except ModuleNotFoundError:
+    EXCEL_ENGINE = "openpyxl"
+
+# Parquet cache of the Excel files (only if 'pyarrow' is installed)
+try:
+    import pyarrow
+    PARQUET_CACHE = True
+except ModuleNotFoundError:
+    PARQUET_CACHE = False
             
             
-# user inputs
-np.random.seed(100)
+# Phase connection codes (e.g. 'RWB', 'RB', 'W') to OpenDSS node numbers (e.g. '1.2.3', '1.3', '2')
+CHAR_TO_NUM = {'RWB': '1.2.3', 'RBW': '1.3.2', 'WRB': '2.1.3', 'WBR': '2.3.1', 'BRW': '3.1.2', 'BWR': '3.2.1',
+               'RW': '1.2', 'RB': '1.3', 'WR': '2.1', 'WB': '2.3', 'BR': '3.1', 'BW': '3.2',
+               'R': '1', 'W': '2', 'B': '3'}
+
+# Coordinate reference system of the GIS data of the networks (parsed once, shared by all the layers)
+NETWORK_CRS = CRS.from_epsg(4462)
+
+# Columns read from the sheets of the OpenDSS elements that are only used to build the circuit: the columns read by
+# the builders of the DSSDriver, and by the network table (the other columns of these sheets are not loaded).
+# Sheets not listed here are read in full.
+SHEET_COLUMNS = {
+    "linecodes": ["Linecode_ID", "Phases", "r1", "x1", "b1", "r0", "x0", "b0", "Units", "Ampacity1", "Ampacity2"],
+    "mvtx": ["Substation_ID", "Bus1", "Bus2", "kvs_primary", "kvs_secondary", "kvas_primary", "kvas_secondary",
+             "xhl", "loadloss", "noloadloss", "wdg1_numtaps", "Conn_Type"],
+    "lv_lines": ["line_name", "bus1", "bus2", "phases", "length", "units", "linecode"],
+}
 
 # %% Section 2: Classes and Definitions
 
@@ -48,6 +80,8 @@ def check_data():
 
     If the folder is found, adjust the working directory and print the path.
     If the folder is not found, print an error message indicating its absence.
+
+    Returns the names of the network (.xlsx) files found, which can be passed to identify_network.
     """
     current_directory = os.getcwd()
 #     data_folder_name = "Network_Data"
@@ -55,25 +89,22 @@ def check_data():
 
     if os.path.exists(current_directory) and os.path.isdir(current_directory):
         os.chdir(current_directory)
-        networks = [n for n in os.listdir(current_directory) if
-                    n.lower().endswith(".xlsx") and os.path.isfile(os.path.join(current_directory, n))]
-        if {'Network_3_Urban_HPK11.xlsx', 'Network_4_Urban_CRE21.xlsx', 'Network_1_Rural_SMR8.xlsx', 'Network_2_Rural_KLO14.xlsx'} != set(networks):
+        # Single scan of the directory for the network (.xlsx) and profile (.npy) files
+        data_files = list_network_files(current_directory, extensions=(".xlsx", ".npy"))
+        networks = {name for name in data_files if name.lower().endswith(".xlsx")}
+        profiles = data_files - networks
+
+        if {'Network_3_Urban_HPK11.xlsx', 'Network_4_Urban_CRE21.xlsx', 'Network_1_Rural_SMR8.xlsx', 'Network_2_Rural_KLO14.xlsx'} != networks:
             raise MissingExcelSheetsError(f"Excel sheets are missing in this folder. Please Check")
         else:
             print("\033[1;92mAll the required excel files including network data for running this code is available.\033[0m")
-    else:
-        os.chdir(current_directory)
-        print("\033[1;91mThere is some issue in the current directory.\033[0m")
-    
-    
-    if os.path.exists(current_directory) and os.path.isdir(current_directory):
-        os.chdir(current_directory)
-        profiles = [n for n in os.listdir(current_directory) if
-                    n.lower().endswith(".npy") and os.path.isfile(os.path.join(current_directory, n))]
-        if {'Com_load_data_30min_res.npy', 'Res_load_data_30min_res.npy'} != set(profiles):
+
+        if {'Com_load_data_30min_res.npy', 'Res_load_data_30min_res.npy'} != profiles:
             raise MissingExcelSheetsError(f"Profiles data are missing in this folder. Please Check")
         else:
             print("\033[1;92mAll the required profile data for running this code is available.\033[0m")
+
+        return networks
     else:
         os.chdir(current_directory)
         print("\033[1;91mThere is some issue in the current directory.\033[0m")
@@ -82,9 +113,19 @@ def check_data():
 #     return data_folder_path
 
 
-def identify_network():
+def list_network_files(directory, extensions=(".xlsx",)):
+    """
+    Names of the files of a directory with the given extensions (by default the network (.xlsx) files), found with a
+    single scan.
+    """
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries if entry.is_file() and entry.name.lower().endswith(extensions)}
+
+
+def identify_network(network_files=None):
     """
     Prompt the user to enter a network name, convert it to uppercase, and print the identification process.
+    The names of the network files returned by check_data can be given to avoid scanning the directory again.
     """
     
     while True:
@@ -101,16 +142,18 @@ def identify_network():
                 network_prefix = net_names[options.index(user_input)].split("_")
                 
                 # Search for Excel files matching the network name
-                pattern = f"{current_directory}/{network_prefix[0]}_{network_prefix[1]}_*.xlsx"
+                if network_files is None:
+                    network_files = list_network_files(current_directory)
+                file_prefix = f"{network_prefix[0]}_{network_prefix[1]}_"
                 
-                matched_files = glob.glob(pattern)
+                matched_files = sorted(name for name in network_files if name.startswith(file_prefix))
                 
                 if matched_files:
-                    network_name = os.path.basename(matched_files[0])  # Assuming the first match is the correct file
+                    network_name = matched_files[0]  # Assuming the first match is the correct file
                     data_folder_path = os.path.join(current_directory, network_name)
                     print("\033[1;92mThe circuit's information file is': ", network_name, "\033[0m")
                     all_data = NetworkData(name=user_input, data_location=data_folder_path)
-                    data = all_data.get_network_data()
+                    data = all_data.data  # Already loaded when NetworkData is created
                     network_gp = all_data.network_plotting()
                     break
                 else:
@@ -129,6 +172,62 @@ def identify_network():
     
     return data, network_gp
 
+def _sheet_usecols(sheet_name):
+    """
+    'usecols' argument of pandas for a sheet: the columns listed in SHEET_COLUMNS (if present in the sheet), or all of them.
+    """
+    columns = SHEET_COLUMNS.get(sheet_name)
+    if columns is None:
+        return None
+    return lambda column: column in columns
+
+
+def _str_columns(frame, columns):
+    """
+    Return the given columns of a DataFrame as arrays of strings, ready to be zipped into OpenDSS commands.
+    """
+    return [frame[column].astype(str).to_numpy() for column in columns]
+
+
+# Cell types of the mixed-type columns that the Parquet cache can store, with the function that reads each one back from
+# its text (the text of a float is its repr, so it is read back exactly, including 'nan' and 'inf')
+_CELL_TYPES = {"int": int, "float": float, "str": str, "bool": lambda text: text == "True", "NoneType": lambda text: None}
+
+
+def _encode_cells(column):
+    """
+    Text and type name of each cell of a mixed-type column, to store it in the Parquet cache.
+    """
+    types = column.map(lambda value: type(value).__name__)
+    unsupported = set(types) - set(_CELL_TYPES)
+    if unsupported:
+        raise ValueError(f"column '{column.name}' has cells of type {sorted(unsupported)}")
+    return column.map(repr).where(types == "float", column.astype(str)), types
+
+
+def _decode_cells(texts, types):
+    """
+    Cells of a mixed-type column stored in the Parquet cache by '_encode_cells', with their original types.
+    """
+    return pd.Series([_CELL_TYPES[cell_type](text) for text, cell_type in zip(texts, types)],
+                     index=texts.index, name=texts.name, dtype=object)
+
+
+def _mvtx_kinds(mvtx):
+    """
+    Voltage regulators ('_REG' in their Substation_ID) and MV/MV transformers among the rows of an 'mvtx' sheet
+    (None if the network has no such sheet), as two boolean arrays. Rows without a Substation_ID are neither, and
+    IDs that are not text (e.g. a sheet with no regulators read as numbers) are compared as text.
+    """
+    if mvtx is None or "Substation_ID" not in mvtx.columns:
+        no_rows = np.zeros(0 if mvtx is None else len(mvtx), dtype=bool)
+        return no_rows, no_rows
+    ids = mvtx["Substation_ID"]
+    has_id = ids.notna().to_numpy(dtype=bool)
+    is_reg = ids.astype(str).str.contains('_REG', regex=False, na=False).to_numpy(dtype=bool) & has_id
+    return is_reg, has_id & ~is_reg
+
+
 class NetworkData:
     """
     tis is
@@ -142,59 +241,140 @@ class NetworkData:
         self.data_location: dict = data_location
         self.data: dict = {}
         self.get_network_data()
+        # Length of the connection type of the MV/LV transformers (3 characters for three-phase ones)
+        self._lvtx_conn_len = self.data['lvtx']["Conn_Type"].astype(str).str.len().to_numpy()
+        self._lvtx_is_3ph = self._lvtx_conn_len == 3
+        # Voltage regulators and MV/MV transformers (empty if the network has no 'mvtx' sheet)
+        self._mvtx_is_reg, self._mvtx_is_mvmv = _mvtx_kinds(self.data.get('mvtx'))
         self.tabulate_data()
         # self.network_plotting()
         
 
     def get_network_data(self):
-        sheets = self.get_excel_sheet_names()
-        for sheet_name in tqdm(sheets, desc=f"Extracting data: ", unit="sheet"):
-            self.data[sheet_name] = pd.read_excel(self.data_location, sheet_name=sheet_name)
-        
+        # Sheets cached as Parquet files by a previous run avoid parsing the Excel file again
+        if not self.read_parquet_cache():
+            self.read_excel_data()
+            if self.data:
+                self.write_parquet_cache()
+
         return self.data
 
-    def get_excel_sheet_names(self):
+    def read_excel_data(self):
         try:
-            xl = pd.ExcelFile(r""+self.data_location)
-            sheet_names = xl.sheet_names
-            
-            return sheet_names
-        
+            # Open the workbook once and parse every sheet from the same handle
+            with pd.ExcelFile(self.data_location, engine=EXCEL_ENGINE) as xl:
+                for sheet_name in tqdm(xl.sheet_names, desc=f"Extracting data: ", unit="sheet"):
+                    self.data[sheet_name] = xl.parse(sheet_name, usecols=_sheet_usecols(sheet_name))
+
         except FileNotFoundError:
             print("File not found or incorrect path.")
-            
-            return None
+
+        return self.data
+
+    def parquet_cache_location(self):
+        return os.path.splitext(self.data_location)[0] + ".parquet.d"
+
+    def read_parquet_cache(self):
+        """
+        Load the sheets from the Parquet cache of the Excel file. Returns False if there is no cache, if it is
+        older than the Excel file, if it was written with other SHEET_COLUMNS or another Excel engine, or if it is damaged.
+        """
+        if not PARQUET_CACHE:
+            return False
+
+        cache_location = self.parquet_cache_location()
+        try:
+            with open(os.path.join(cache_location, "sheets.json")) as f:
+                cache_index = json.load(f)
+            source = os.stat(self.data_location)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            if (cache_index["source_mtime"] != source.st_mtime or cache_index["source_size"] != source.st_size
+                    or cache_index.get("sheet_columns") != SHEET_COLUMNS or cache_index.get("engine") != EXCEL_ENGINE):
+                return False
+
+            for i, sheet_name in enumerate(tqdm(cache_index["sheets"], desc=f"Extracting data (cache): ", unit="sheet")):
+                sheet_data = pd.read_parquet(os.path.join(cache_location, f"sheet_{i}.parquet"), engine="pyarrow")
+                type_columns = []
+                for column, type_column in cache_index["mixed_columns"].get(sheet_name, []):
+                    sheet_data[column] = _decode_cells(sheet_data[column], sheet_data[type_column])
+                    type_columns.append(type_column)
+                self.data[sheet_name] = sheet_data.drop(columns=type_columns)
+
+        # A damaged cache (missing or corrupted files, incomplete index) is ignored, so the Excel file is read again
+        # and the cache is rewritten
+        except (OSError, ValueError, KeyError, TypeError, pyarrow.ArrowException) as e:
+            print(f"The Parquet cache of the network data could not be read, the Excel file is used instead: {e}")
+            self.data.clear()
+            return False
+
+        return True
+
+    def write_parquet_cache(self):
+        """
+        Save the sheets as Parquet files next to the Excel file (one per sheet, plus an index with the sheet names).
+        Columns mixing text and numbers (e.g. 'SourceBus' and node numbers) are stored as text, along with a column
+        holding the type of each cell, so they are read back exactly as they were read from the Excel file.
+        """
+        if not PARQUET_CACHE:
+            return
+
+        cache_location = self.parquet_cache_location()
+        try:
+            os.makedirs(cache_location, exist_ok=True)
+            mixed_columns = {}
+            for i, (sheet_name, sheet_data) in enumerate(self.data.items()):
+                mixed = [column for column in sheet_data.columns
+                         if sheet_data[column].dtype == object and sheet_data[column].map(type).nunique() > 1]
+                if mixed:
+                    sheet_data = sheet_data.copy()
+                    mixed_columns[sheet_name] = []
+                    for column in mixed:
+                        type_column = f"__type__{column}"
+                        sheet_data[column], sheet_data[type_column] = _encode_cells(sheet_data[column])
+                        mixed_columns[sheet_name].append((column, type_column))
+                sheet_data.to_parquet(os.path.join(cache_location, f"sheet_{i}.parquet"), engine="pyarrow",
+                                      compression="zstd", index=False)
+
+            # The index is written last, so an interrupted write never leaves a valid cache behind
+            source = os.stat(self.data_location)
+            cache_index = {"sheets": list(self.data), "mixed_columns": mixed_columns,
+                           "source_mtime": source.st_mtime, "source_size": source.st_size, "sheet_columns": SHEET_COLUMNS,
+                           "engine": EXCEL_ENGINE}
+            with open(os.path.join(cache_location, "sheets.json"), "w") as f:
+                json.dump(cache_index, f)
+
+        except (OSError, ValueError, pyarrow.ArrowException) as e:
+            print(f"The Parquet cache of the network data could not be written: {e}")
 
     def tabulate_data(self):
         # for keys in self.data_locations.items():
         
         # Getting data from the dataframes:
             
+        # Substation types and customer phases (each column is counted once)
+        tx_type_counts = self.data['lvtx']["Type"].value_counts()
+        cus_phases_counts = self.data['lv_loads']["phases"].value_counts()
         # Number of residential substations:
-        n_res_txs = self.data['lvtx']["Type"].value_counts().get('RES', 0)
+        n_res_txs = tx_type_counts.get('RES', 0)
         # Number of residential customers:
-        n_res_cus = self.data['lv_loads']["phases"].value_counts().get(1, 0)
+        n_res_cus = cus_phases_counts.get(1, 0)
         # Number of non-residential substations:
-        n_com_txs = self.data['lvtx']["Type"].value_counts().get('COM', 0)
+        n_com_txs = tx_type_counts.get('COM', 0)
         # Number of non-residential customers:
-        n_com_cus = self.data['lv_loads']["phases"].value_counts().get(3, 0)
-        # Number of MV/MV transformers
-        try:
-            n_mvmv_txs = (~self.data['mvtx']["Substation_ID"].str.contains('_REG')).sum()
-        except:
-            n_mvmv_txs = 0
-        # Number of Regulators
-        try:
-            n_reg_txs = self.data['mvtx']["Substation_ID"].str.contains('_REG').sum()
-        except:
-            n_reg_txs = 0
+        n_com_cus = cus_phases_counts.get(3, 0)
+        # Number of MV/MV transformers and Regulators
+        n_reg_txs = int(self._mvtx_is_reg.sum())
+        n_mvmv_txs = int(self._mvtx_is_mvmv.sum())
         # Number of capacitors:
         try:
             n_caps = self.data['mvcaps']["phases"].value_counts().get(3, 0)
         except:
             n_caps = 0
         # Number of SWER transformers
-        n_swer_txs = len(self.data['lvtx'][self.data['lvtx']["Conn_Type"].astype(str).str.len() != 3])
+        n_swer_txs = int((~self._lvtx_is_3ph).sum())
         # Length of MV conductors
         len_mv_lines = self.data["lines"]["Length"].sum()
         # Length of MV SWER conductors
@@ -228,40 +408,52 @@ class NetworkData:
         print("\033[1;92mNetwork Data\033[0m")
         print(tabulate(filtered_data, headers=['Parameter', 'Quantity'], tablefmt="github"))
         
-    def network_plotting(self):
+    def network_plotting(self, plot=None):
         
-        " This function creates the plot of the circuit by using geopandas"
+        """
+        This function creates the GeoDataFrames of the circuit and plots them by using geopandas.
+        The plot is skipped if 'plot' is False. When 'plot' is not given, the network is plotted only if the MVLV_PLOT
+        environment variable is unset or "1".
+        """
+        self.build_gis_layers()
+        if plot is None:
+            plot = os.environ.get("MVLV_PLOT", "1") == "1"
+        if plot:
+            self.plot_network()
+            
+        return self.network_gp
+
+    def build_gis_layers(self):
+        
+        " This function creates the GeoDataFrames of the circuit (no plotting)"
         
         # Coordinate system to use (for Australian cases)
-        desired_crs = 'EPSG:4462'
+        desired_crs = NETWORK_CRS
         
         ####### MV Nodes setup:
             
         # Calling the file with the node information
         mvbuses_layer = self.data["buscoords"]
 
-        # Create Point geometries from X and Y coordinates
-        geometry = [Point(xy) for xy in zip(mvbuses_layer['NodeStartX'], mvbuses_layer['NodeStartY'])]
+        # X and Y coordinates of the nodes as an (N, 2) array, and a hash index of the nodes (built once, used for all the layers)
+        bus_xy = mvbuses_layer[['NodeStartX', 'NodeStartY']].to_numpy(dtype=float)
+        # (a Node_ID repeated in 'buscoords' resolves to its first row)
+        bus_first_rows = np.flatnonzero(~mvbuses_layer['Node_ID'].duplicated().to_numpy())
+        bus_index = pd.Index(mvbuses_layer['Node_ID'].to_numpy()[bus_first_rows])
+
+        def node_positions(nodes):
+            positions = bus_index.get_indexer(nodes)
+            if (positions < 0).any():
+                raise KeyError(f"Nodes not found in 'buscoords': {list(pd.Index(nodes)[positions < 0])}")
+            return bus_first_rows[positions]
 
-        # Create a GeoDataFrame
-        mvbuses_layer_gp = gp.GeoDataFrame(mvbuses_layer, geometry=geometry, crs=desired_crs)  
-        # Set the geometry column name
-        mvbuses_layer_gp = mvbuses_layer_gp.set_geometry('geometry')
-        # Set the GeoDataframe index
-        mvbuses_layer_gp.index = mvbuses_layer_gp["Node_ID"]
-        
         ####### MV transformer:
 
         # Calling the file with the node information
         mvtx_layer = self.data["mv_net_txs"]
 
-        # Create geometries using nodes' geometries from 'mv_buses_layer_gp'
-        mvtx_geometries = []
-        for idx, row in mvtx_layer.iterrows():
-            start_node = row['Bus2']
-            
-            mvtx_geometry = mvbuses_layer_gp.loc[start_node, 'geometry']  # Get start node geometry
-            mvtx_geometries.append(mvtx_geometry)
+        # Create geometries using the coordinates of the nodes
+        mvtx_geometries = shapely.points(bus_xy[node_positions(mvtx_layer['Bus2'])])
 
         self.mvtxs_layer_gp = gp.GeoDataFrame(mvtx_layer, geometry=mvtx_geometries, crs=desired_crs)
         
@@ -270,17 +462,10 @@ class NetworkData:
         # Calling the file with the node information
         mvlines_layer = self.data["lines"].loc[self.data["lines"]["Element_Name"].str.lower()!="delete"]
 
-        # Create LineString geometries using nodes' geometries from 'mv_buses_layer_gp'
-        line_geometries = []
-        for idx, row in mvlines_layer.iterrows():
-            start_node = row['Start_Node']
-            end_node = row['End_Node']
-            
-            start_geometry = mvbuses_layer_gp.loc[start_node, 'geometry']  # Get start node geometry
-            end_geometry = mvbuses_layer_gp.loc[end_node, 'geometry']      # Get end node geometry
-            
-            line = LineString([start_geometry, end_geometry])  # Create LineString using start and end geometries
-            line_geometries.append(line)
+        # Create LineString geometries using the coordinates of the start and end nodes
+        # (a single gather into an (N, 2, 2) array: line, start/end node, x/y)
+        ends_pos = np.stack([node_positions(mvlines_layer['Start_Node']), node_positions(mvlines_layer['End_Node'])], axis=1)
+        line_geometries = shapely.linestrings(bus_xy[ends_pos])
 
         self.mvlines_layer_gp = gp.GeoDataFrame(mvlines_layer, geometry=line_geometries, crs=desired_crs)
         
@@ -289,13 +474,8 @@ class NetworkData:
         # Calling the file with the node information
         txs_layer = self.data['lvtx']
 
-        # Create geometries using nodes' geometries from 'mv_buses_layer_gp'
-        tx_geometries = []
-        for idx, row in txs_layer.iterrows():
-            start_node = row['Bus1']
-            
-            tx_geometry = mvbuses_layer_gp.loc[start_node, 'geometry']  # Get start node geometry
-            tx_geometries.append(tx_geometry)
+        # Create geometries using the coordinates of the nodes
+        tx_geometries = shapely.points(bus_xy[node_positions(txs_layer['Bus1'])])
 
         self.txs_layer_gp = gp.GeoDataFrame(txs_layer, geometry=tx_geometries, crs=desired_crs)
         
@@ -304,13 +484,8 @@ class NetworkData:
         try:
             caps_layer = self.data['mvcaps']
         
-            # Create geometries using nodes' geometries from 'mv_buses_layer_gp'
-            caps_geometries = []
-            for idx, row in caps_layer.iterrows():
-                start_node = row['Bus1']
-                
-                cap_geometry = mvbuses_layer_gp.loc[start_node, 'geometry']  # Get start node geometry
-                caps_geometries.append(cap_geometry)
+            # Create geometries using the coordinates of the nodes
+            caps_geometries = shapely.points(bus_xy[node_positions(caps_layer['Bus1'])])
     
             self.caps_layer_gp = gp.GeoDataFrame(caps_layer, geometry=caps_geometries, crs=desired_crs)
             cap_flag = True
@@ -327,7 +502,14 @@ class NetworkData:
         if cap_flag:
             self.network_gp["caps"] = self.caps_layer_gp
         
-        ###### Plotting
+        return self.network_gp
+
+    def plot_network(self):
+        
+        " This function creates the plot of the circuit (built by 'build_gis_layers') by using geopandas"
+        
+        cap_flag = "caps" in self.network_gp
+        
         if "urban" in self.network_name.lower():
     
             # Create a figure and axis
@@ -372,9 +554,9 @@ class NetworkData:
             # Plot the GeoDataFrames
             self.mvtxs_layer_gp.plot(ax=ax, color="black", alpha=0.7, marker="^", markersize=264, label='MV tx', zorder=1)
             self.mvlines_layer_gp.plot(ax=ax, color="grey", alpha=0.7, label='MV Lines', zorder=2, linewidth=2.5)
-            self.txs_layer_gp.loc[(self.txs_layer_gp["Type"] == "COM") & (self.txs_layer_gp["Conn_Type"].str.len() == 3)].plot(ax=ax, color="blue", alpha=1, marker="o", markersize=32, label='MV/LV txs - 3ph - Com', zorder=3)
-            self.txs_layer_gp.loc[(self.txs_layer_gp["Type"] == "RES") & (self.txs_layer_gp["Conn_Type"].str.len() == 3)].plot(ax=ax, color="black", alpha=1, marker="o", markersize=32, label='MV/LV txs - 3ph - Res', zorder=3)
-            self.txs_layer_gp.loc[(self.txs_layer_gp["Type"] == "RES") & (self.txs_layer_gp["Conn_Type"].str.len() != 3)].plot(ax=ax, color="sandybrown", alpha=1, marker="o", markersize=32, label='MV/LV txs - 1ph - Res', zorder=3)
+            self.txs_layer_gp.loc[(self.txs_layer_gp["Type"] == "COM").to_numpy() & self._lvtx_is_3ph].plot(ax=ax, color="blue", alpha=1, marker="o", markersize=32, label='MV/LV txs - 3ph - Com', zorder=3)
+            self.txs_layer_gp.loc[(self.txs_layer_gp["Type"] == "RES").to_numpy() & self._lvtx_is_3ph].plot(ax=ax, color="black", alpha=1, marker="o", markersize=32, label='MV/LV txs - 3ph - Res', zorder=3)
+            self.txs_layer_gp.loc[(self.txs_layer_gp["Type"] == "RES").to_numpy() & ~self._lvtx_is_3ph].plot(ax=ax, color="sandybrown", alpha=1, marker="o", markersize=32, label='MV/LV txs - 1ph - Res', zorder=3)
             if cap_flag:
                 self.caps_layer_gp.plot(ax=ax, color="darkslateblue", alpha=1, marker="s", markersize=64, label='LV txs_res', zorder=3)
     
@@ -403,8 +585,6 @@ class NetworkData:
             ax.set_title("Network Topology", fontsize=10)
             plt.tight_layout()
             plt.show()
-            
-        return self.network_gp
 
 
 class DSSDriver:
@@ -474,6 +654,21 @@ class DSSDriver:
     
         return date_str, season
     
+    def send_commands(self, commands):
+        """
+        Send a batch of OpenDSS commands in a single call, by writing them to a temporary script and redirecting OpenDSS to it.
+        """
+        if not commands:
+            return
+
+        fd, script_path = tempfile.mkstemp(suffix=".dss")
+        try:
+            with os.fdopen(fd, "w") as script:
+                script.write("\n".join(commands))
+            self.dss_text.Command = f'Redirect "{script_path}"'
+        finally:
+            os.remove(script_path)
+
     def basic_opendss_actions(self):
         self.dss_text.Command = 'clear'
         self.dss_text.Command = 'Set DefaultBaseFrequency = 50'
@@ -486,98 +681,118 @@ class DSSDriver:
 
     def mv_net_tx(self):
         element = self.data["mv_net_txs"]
-        for index, row in tqdm(element.iterrows(), desc="Building the circuit - MV Transformers  : ", total=len(element)):
-            mv_tx_data = (f"New Transformer.{row['Substation_ID']} "
+        commands = []
+        columns = _str_columns(element, ["Substation_ID", "Bus1", "Bus2", "Connection_Primary", "Connection_Secondary", "kvs_primary",
+                                         "kvs_secondary", "kvas_primary", "kvas_secondary", "loadloss", "noloadloss", "xhl"])
+        for sub_id, bus1, bus2, conn1, conn2, kv1, kv2, kva1, kva2, loadloss, noloadloss, xhl in tqdm(zip(*columns), desc="Building the circuit - MV Transformers  : ", total=len(element)):
+            mv_tx_data = (f"New Transformer.{sub_id} "
                           f"phases=3 "
                           f"windings=2 "
-                          f"buses=[{row['Bus1']}, mv_f0_n{row['Bus2']}] "
-                          f"conns=[{row['Connection_Primary']}, {row['Connection_Secondary']}] "
-                          f"kVs=[{row['kvs_primary']}, {row['kvs_secondary']}] "
-                          f"kVAs=[{row['kvas_primary']}, {row['kvas_secondary']}] "
-                          f"%loadloss={row['loadloss']} "
-                          f"%noloadloss={row['noloadloss']} "
-                          f"xhl={row['xhl']} "
+                          f"buses=[{bus1}, mv_f0_n{bus2}] "
+                          f"conns=[{conn1}, {conn2}] "
+                          f"kVs=[{kv1}, {kv2}] "
+                          f"kVAs=[{kva1}, {kva2}] "
+                          f"%loadloss={loadloss} "
+                          f"%noloadloss={noloadloss} "
+                          f"xhl={xhl} "
                           f"enabled=true")
-            self.dss_text.Command = mv_tx_data
+            commands.append(mv_tx_data)
+        self.send_commands(commands)
         
     def line_codes(self):
         element = self.data["linecodes"]
-        for index, row in tqdm(element.iterrows(), desc="Building the circuit - Linecodes        : ", total=len(element)):
-            linecode_data = (f"new linecode.lc_{row['Linecode_ID']} "
-                             f"nphases={row['Phases']} "
-                             f"r1={row['r1']} "
-                             f"x1={row['x1']} "
-                             f"b1={row['b1']} "
-                             f"r0={row['r0']} "
-                             f"b0={row['b0']} "
-                             f"x0={row['x0']} "
-                             f"units={row['Units']} "
-                             f"normamp={min(row['Ampacity1'], row['Ampacity2'])} ")
+        commands = []
+        columns = _str_columns(element, ["Linecode_ID", "Phases", "r1", "x1", "b1", "r0", "b0", "x0", "Units"])
+        normamps = [min(amp1, amp2) for amp1, amp2 in zip(element["Ampacity1"].tolist(), element["Ampacity2"].tolist())]
+        for lc_id, phases, r1, x1, b1, r0, b0, x0, units, normamp in tqdm(zip(*columns, normamps), desc="Building the circuit - Linecodes        : ", total=len(element)):
+            linecode_data = (f"new linecode.lc_{lc_id} "
+                             f"nphases={phases} "
+                             f"r1={r1} "
+                             f"x1={x1} "
+                             f"b1={b1} "
+                             f"r0={r0} "
+                             f"b0={b0} "
+                             f"x0={x0} "
+                             f"units={units} "
+                             f"normamp={normamp} ")
             
             # print(linecode_data)
-            self.dss_text.Command = linecode_data
+            commands.append(linecode_data)
+        self.send_commands(commands)
 
     def connections(self):
         element = self.data["lines"]
-        for index, row in tqdm(element.iterrows(), desc="Building the circuit - MV Lines         : ", total=len(element)):
-            if row["Element_Name"].lower() != "delete":
-                mv_line_data = (f"new line.mv_f0_l{row['Line_Number']} "
-                                f"bus1=mv_f0_n{row['Start_Node']}.{row['Start_Node_Phase']} "
-                                f"bus2=mv_f0_n{row['End_Node']}.{row['End_Node_Phase']} "
-                                f"phases={row['Phases']} "
-                                f"length={row['Length']} "
-                                f"units={row['Units']} "
-                                f"linecode=lc_{row['Linecode']}-{row['Phases']}ph "
+        commands = []
+        # Rows of the lines built, and their OpenDSS names and ampacities (written to the GIS data at the end)
+        built_rows, dss_names, ampacities = [], [], []
+        # Ampacity of each linecode (the first row of a repeated Linecode_ID is used)
+        linecodes = self.data["linecodes"].drop_duplicates("Linecode_ID")
+        amp_by_code = dict(zip(linecodes["Linecode_ID"], linecodes["Ampacity1"]))
+        columns = _str_columns(element, ["Element_Name", "Line_Number", "Start_Node", "Start_Node_Phase", "End_Node", "End_Node_Phase",
+                                         "Phases", "Length", "Units", "Linecode"])
+        for index, name, line_no, start, start_ph, end, end_ph, phases, length, units, linecode in tqdm(zip(element.index, *columns), desc="Building the circuit - MV Lines         : ", total=len(element)):
+            if name.lower() != "delete":
+                mv_line_data = (f"new line.mv_f0_l{line_no} "
+                                f"bus1=mv_f0_n{start}.{start_ph} "
+                                f"bus2=mv_f0_n{end}.{end_ph} "
+                                f"phases={phases} "
+                                f"length={length} "
+                                f"units={units} "
+                                f"linecode=lc_{linecode}-{phases}ph "
                                 f"enabled=true")
-                self.dss_text.Command = mv_line_data
-                self.gis_data["MV_lines"].loc[index, "DSSNAME"] = f"mv_f0_l{row['Line_Number']}"
+                commands.append(mv_line_data)
+                built_rows.append(index)
+                dss_names.append(f"mv_f0_l{line_no}")
                 
                 # Ampacity determination:
-                amp = self.data["linecodes"].loc[self.data["linecodes"]["Linecode_ID"] == f"{row['Linecode']}-{row['Phases']}ph", "Ampacity1" ].values[0]
-                self.gis_data["MV_lines"].loc[index, "Ampacity"] = amp
+                ampacities.append(amp_by_code[f"{linecode}-{phases}ph"])
+        self.send_commands(commands)
+        
+        if built_rows:
+            self.gis_data["MV_lines"].loc[built_rows, "DSSNAME"] = dss_names
+            self.gis_data["MV_lines"].loc[built_rows, "Ampacity"] = ampacities
             
     def capacitors(self):
         element = self.data["mvcaps"]
-        for index, row in tqdm(element.iterrows(), desc="Building the circuit - MV Capacitors    : ", total=len(element)):
-            mv_caps_data = (f"new capacitor.mv_f0_l{row['Element_ID']} "
-                            f"bus1=mv_f0_n{row['Bus1']}.1.2.3 "
-                            f"phases={row['phases']} "
-                            f"kvar={row['kvar']} "
-                            f"kV={row['kvs']}")
-            self.dss_text.Command = mv_caps_data
+        commands = []
+        columns = _str_columns(element, ["Element_ID", "Bus1", "phases", "kvar", "kvs"])
+        for element_id, bus1, phases, kvar, kvs in tqdm(zip(*columns), desc="Building the circuit - MV Capacitors    : ", total=len(element)):
+            mv_caps_data = (f"new capacitor.mv_f0_l{element_id} "
+                            f"bus1=mv_f0_n{bus1}.1.2.3 "
+                            f"phases={phases} "
+                            f"kvar={kvar} "
+                            f"kV={kvs}")
+            commands.append(mv_caps_data)
+        self.send_commands(commands)
     
     def mv_txs(self):
-        three_ph_combi = [''.join(perm) for perm in list(permutations(['R', 'W', 'B']))]
-        two_ph_combi = [''.join(perm) for perm in list(permutations(['R', 'B', 'W'], 2))]
-        one_ph_combi = [''.join(perm) for perm in list(permutations(['R', 'B', 'W'], 1))]
-        char_to_num = {key: '.'.join(str({'R': 1, 'W': 2, 'B': 3}[char]) for char in key) for key in three_ph_combi + two_ph_combi+one_ph_combi}
-        
         element = self.data["mvtx"]
         
-        for index, row in element.iterrows():
-            kva1 = row["kvs_primary"]
-            kva2 = row["kvs_secondary"]
+        commands = []
+        for row in element.itertuples():
+            kva1 = row.kvs_primary
+            kva2 = row.kvs_secondary
             
             if kva1 != kva2:
             
-                mv_tx = (f"new transformer.{row['Substation_ID']} "
-                                f"buses=[mv_f0_n{row['Bus1']}.{char_to_num[row['Conn_Type']]} mv_f0_n{row['Bus2']}.1.0 mv_f0_n{row['Bus2']}.0.2] "
+                mv_tx = (f"new transformer.{row.Substation_ID} "
+                                f"buses=[mv_f0_n{row.Bus1}.{CHAR_TO_NUM[row.Conn_Type]} mv_f0_n{row.Bus2}.1.0 mv_f0_n{row.Bus2}.0.2] "
                                 f"phases=1 "
                                 f"windings=3 "
                                 f"conns=[Delta Wye Wye] "
-                                f"kVs=[{row['kvs_primary']} {row['kvs_secondary']} {row['kvs_secondary']}] "
-                                f"kVAs=[{row['kvas_primary']} {row['kvas_secondary']} {row['kvas_secondary']}] "
-                                f"xhl={row['xhl']} "
-                                f"%noloadloss={row['noloadloss']} "
-                                f"%loadloss={row['loadloss']}")
+                                f"kVs=[{row.kvs_primary} {row.kvs_secondary} {row.kvs_secondary}] "
+                                f"kVAs=[{row.kvas_primary} {row.kvas_secondary} {row.kvas_secondary}] "
+                                f"xhl={row.xhl} "
+                                f"%noloadloss={row.noloadloss} "
+                                f"%loadloss={row.loadloss}")
 
-                self.dss_text.Command = mv_tx
+                commands.append(mv_tx)
             
             # if kva1 == kva2, then it is a autotransformer regulator
             else: 
                 
                 #Regulator
-                self.dss_text.Command = "set maxcontroliter=100"
+                commands.append("set maxcontroliter=100")
                 
                 # Reactors
                 
@@ -587,16 +802,16 @@ class DSSDriver:
                 # The out jumper goes from the transformer bus to bus2
                 
                 # Phase A
-                self.dss_text.Command = f"New Reactor.Jumper_{row['Substation_ID']}_A_E phases=1 bus1=mv_f0_n{row['Bus1']}.1 bus2=Jumper_{row['Substation_ID']}_A.2 X=0.0001 R=0.0001"
-                self.dss_text.Command = f"New Reactor.Jumper_{row['Substation_ID']}_A_O phases=1  bus1=Jumper_{row['Substation_ID']}_A.1 bus2=mv_f0_n{row['Bus2']}.1 X=0.0001 R=0.0001"
+                commands.append(f"New Reactor.Jumper_{row.Substation_ID}_A_E phases=1 bus1=mv_f0_n{row.Bus1}.1 bus2=Jumper_{row.Substation_ID}_A.2 X=0.0001 R=0.0001")
+                commands.append(f"New Reactor.Jumper_{row.Substation_ID}_A_O phases=1  bus1=Jumper_{row.Substation_ID}_A.1 bus2=mv_f0_n{row.Bus2}.1 X=0.0001 R=0.0001")
                 
                 # Phase B
-                self.dss_text.Command = f"New Reactor.Jumper_{row['Substation_ID']}_B_E phases=1 bus1=mv_f0_n{row['Bus1']}.2 bus2=Jumper_{row['Substation_ID']}_B.2 X=0.0001 R=0.0001"
-                self.dss_text.Command = f"New Reactor.Jumper_{row['Substation_ID']}_B_O phases=1  bus1=Jumper_{row['Substation_ID']}_B.1 bus2=mv_f0_n{row['Bus2']}.2 X=0.0001 R=0.0001"
+                commands.append(f"New Reactor.Jumper_{row.Substation_ID}_B_E phases=1 bus1=mv_f0_n{row.Bus1}.2 bus2=Jumper_{row.Substation_ID}_B.2 X=0.0001 R=0.0001")
+                commands.append(f"New Reactor.Jumper_{row.Substation_ID}_B_O phases=1  bus1=Jumper_{row.Substation_ID}_B.1 bus2=mv_f0_n{row.Bus2}.2 X=0.0001 R=0.0001")
                 
                 # Phase C
-                self.dss_text.Command = f"New Reactor.Jumper_{row['Substation_ID']}_C_E phases=1 bus1=mv_f0_n{row['Bus1']}.3 bus2=Jumper_{row['Substation_ID']}_C.2 X=0.0001 R=0.0001"
-                self.dss_text.Command = f"New Reactor.Jumper_{row['Substation_ID']}_C_O phases=1  bus1=Jumper_{row['Substation_ID']}_C.1 bus2=mv_f0_n{row['Bus2']}.3 X=0.0001 R=0.0001"
+                commands.append(f"New Reactor.Jumper_{row.Substation_ID}_C_E phases=1 bus1=mv_f0_n{row.Bus1}.3 bus2=Jumper_{row.Substation_ID}_C.2 X=0.0001 R=0.0001")
+                commands.append(f"New Reactor.Jumper_{row.Substation_ID}_C_O phases=1  bus1=Jumper_{row.Substation_ID}_C.1 bus2=mv_f0_n{row.Bus2}.3 X=0.0001 R=0.0001")
                 
                 
                 # Now the transformers (1 per phase)
@@ -613,203 +828,237 @@ class DSSDriver:
                 kVAtraf = str(np.round((nt * float(kva1) / (1 + nt)),2))
                 
                 for phase in ["A", "B", "C"]:
-                    mv_tx = (f"new transformer.{row['Substation_ID']}_{phase} "
+                    mv_tx = (f"new transformer.{row.Substation_ID}_{phase} "
                              f"phases=1 "
                              f"windings=2 "
-                             f"xhl={row['xhl']} "
-                             f"%noloadloss={row['noloadloss']} "
-                             f"%loadloss={row['loadloss']} "
+                             f"xhl={row.xhl} "
+                             f"%noloadloss={row.noloadloss} "
+                             f"%loadloss={row.loadloss} "
                              f"wdg=1 "
-                             f"Bus=Jumper_{row['Substation_ID']}_{phase}.1.0 "
+                             f"Bus=Jumper_{row.Substation_ID}_{phase}.1.0 "
                              f"kV={kv} "
                              f"kVA={kVAtraf} "
                              f"wdg=2 "
-                             f"Bus=Jumper_{row['Substation_ID']}_{phase}.1.2 "
+                             f"Bus=Jumper_{row.Substation_ID}_{phase}.1.2 "
                              f"kV={kv/10} "
                              f"kVA={kVAtraf} "
                              f"Maxtap=1.0 "
                              f"Mintap=-1.0 "
                              f"tap=0.0 "
-                             f"numtaps={row['wdg1_numtaps']-1}")
+                             f"numtaps={row.wdg1_numtaps-1}")
                     
                     # print(mv_tx)
-                    self.dss_text.Command = mv_tx
+                    commands.append(mv_tx)
                 
                 # Now the reg control
                 for phase in ["A", "B", "C"]:
-                    reg_control = (f" new regcontrol.Reg_{row['Substation_ID']}_{phase} "
-                                   f"transformer={row['Substation_ID']}_{phase} "
+                    reg_control = (f" new regcontrol.Reg_{row.Substation_ID}_{phase} "
+                                   f"transformer={row.Substation_ID}_{phase} "
                                    f"winding=2 "
-                                   f"bus=Jumper_{row['Substation_ID']}_{phase}.1 "
+                                   f"bus=Jumper_{row.Substation_ID}_{phase}.1 "
                                    f"vreg=100.0 "
                                    f"band=3.0 "
                                    f"ptratio={kv*10} "
                                    f"maxtapchange=1")
                     
                     # print(reg_control)
-                    self.dss_text.Command = reg_control
+                    commands.append(reg_control)
+        self.send_commands(commands)
         return 
 
     def lv_tx(self):
-        three_ph_combi = [''.join(perm) for perm in list(permutations(['R', 'W', 'B']))]
-        two_ph_combi = [''.join(perm) for perm in list(permutations(['R', 'B', 'W'], 2))]
-        one_ph_combi = [''.join(perm) for perm in list(permutations(['R', 'B', 'W'], 1))]
-        char_to_num = {key: '.'.join(str({'R': 1, 'W': 2, 'B': 3}[char]) for char in key) for key in three_ph_combi + two_ph_combi+one_ph_combi}
-
         element = self.data["lvtx"]
-        for index, row in tqdm(element.iterrows(), desc="Building the circuit - LV Transformers  : ", total=len(element)):
-            if len(row['Conn_Type']) == 3:
-                lv_tx_data = (f"new transformer.mv_f0_lv_{row['Substation_ID']} "
-                              f"phases=3 "
-                              f"windings=2 "
-                              f"buses=[mv_f0_n{row['Bus1']} mv_f0_lv{index}_busbar] "
-                              f"conns=[{row['Connection_Primary']} {row['Connection_Secondary']}] "
-                              f"kVs=[{row['kvs_primary']} {row['kvs_secondary']}] "
-                              f"kVAs=[{row['kvas_primary']} {row['kvas_secondary']}] "
-                              f"xhl={row['xhl']} "
-                              f"%noloadloss={row['noloadloss']} "
-                              f"%loadloss={row['loadloss']} "
-                              f"wdg=1 "
-                              f"numtaps=4 "
-                              f"tap={row['wdg1_tap']} "
-                              f"maxtap=1.137 "
-                              f"mintap=1.028")
-                # self.dss_text.Command = lv_tx_data
-                # print(lv_tx_data)
-            elif len(row['Conn_Type']) == 2:
-                lv_tx_data = (f"new transformer.mv_f0_lv_{row['Substation_ID']} "
-                              f"phases=1 "
-                              f"windings=3 "
-                              f"buses=[mv_f0_n{row['Bus1']}.{char_to_num[row['Conn_Type']]} mv_f0_lv{index}_busbar.1.0 mv_f0_lv{index}_busbar.0.2] "
-                              f"conns=[Delta Wye Wye] "
-                              f"kVs=[22 0.25 0.25] "
-                              f"kVAs=[{row['kvas_primary']} {row['kvas_secondary']} {row['kvas_secondary']}] "
-                              f"xhl={row['xhl']} "
-                              f"%noloadloss={row['noloadloss']} "
-                              f"%loadloss={row['loadloss']} "
-                              f"wdg=1 "
-                              f"numtaps=4 "
-                              f"tap={row['wdg1_tap']} "
-                              f"maxtap=1.137 "
-                              f"mintap=1.028")
-            else:
-                lv_tx_data = (f"new transformer.mv_f0_lv_{row['Substation_ID']} "
-                              f"phases=1 "
-                              f"windings=2 "
-                              f"buses=[mv_f0_n{row['Bus1']}.{char_to_num[row['Conn_Type']]} mv_f0_lv{index}_busbar.1] "
-                              f"conns=[Wye Wye] "
-                              f"kVs=[{row['kvs_primary']} {row['kvs_secondary']}] "
-                              f"kVAs=[{row['kvas_primary']} {row['kvas_secondary']}] "
-                              f"xhl={row['xhl']} "
-                              f"%noloadloss={row['noloadloss']} "
-                              f"%loadloss={row['loadloss']} "
-                              f"wdg=1 "
-                              f"numtaps=4 "
-                              f"tap={row['wdg1_tap']} "
-                              f"maxtap=1.137 "
-                              f"mintap=1.028")
-                # self.dss_text.Command = lv_tx_data
-            
-            self.dss_text.Command = lv_tx_data
-            self.gis_data["MVLV_txs"].loc[index, "DSSNAME"] = f"mv_f0_lv_{row['Substation_ID']}"
+        # The commands are built from the columns first, then sent to OpenDSS
+        columns = _str_columns(element, ["Substation_ID", "Bus1", "Connection_Primary", "Connection_Secondary", "kvs_primary", "kvs_secondary",
+                                         "kvas_primary", "kvas_secondary", "xhl", "noloadloss", "loadloss", "wdg1_tap"])
+        # Number of phases and OpenDSS nodes of the connection of each transformer (e.g. 'RB' -> 2 and '1.3')
+        conn_lens = element["Conn_Type"].str.len().to_numpy()
+        conn_nums = element["Conn_Type"].map(CHAR_TO_NUM).to_numpy()
+        # The nodes of the single and two-phase transformers are part of their commands, so an unknown code is an error
+        unknown_conns = pd.isna(conn_nums) & (conn_lens != 3)
+        if unknown_conns.any():
+            raise KeyError(f"Unknown Conn_Type in 'lvtx': {list(pd.unique(element['Conn_Type'].to_numpy()[unknown_conns]))}")
+        # Rows of each type of transformer, built separately (each command is stored in the position of its row,
+        # so the transformers are created in the order of 'lvtx')
+        indexes = element.index.to_numpy()
+        three_ph_rows = np.flatnonzero(conn_lens == 3)
+        two_ph_rows = np.flatnonzero(conn_lens == 2)
+        one_ph_rows = np.flatnonzero((conn_lens != 3) & (conn_lens != 2))
+        
+        def group(rows):
+            return zip(rows, indexes[rows], *(column[rows] for column in columns), conn_nums[rows])
+        
+        commands = [None] * len(element)
+        progress = tqdm(total=len(element), desc="Building the circuit - LV Transformers  : ")
+        
+        # Three-phase transformers
+        for pos, index, sub_id, bus1, conn1, conn2, kv1, kv2, kva1, kva2, xhl, noloadloss, loadloss, tap, conn_num in group(three_ph_rows):
+            commands[pos] = (f"new transformer.mv_f0_lv_{sub_id} "
+                             f"phases=3 "
+                             f"windings=2 "
+                             f"buses=[mv_f0_n{bus1} mv_f0_lv{index}_busbar] "
+                             f"conns=[{conn1} {conn2}] "
+                             f"kVs=[{kv1} {kv2}] "
+                             f"kVAs=[{kva1} {kva2}] "
+                             f"xhl={xhl} "
+                             f"%noloadloss={noloadloss} "
+                             f"%loadloss={loadloss} "
+                             f"wdg=1 "
+                             f"numtaps=4 "
+                             f"tap={tap} "
+                             f"maxtap=1.137 "
+                             f"mintap=1.028")
+        progress.update(len(three_ph_rows))
+        
+        # Single-phase transformers connected between two phases (split-phase secondary)
+        for pos, index, sub_id, bus1, conn1, conn2, kv1, kv2, kva1, kva2, xhl, noloadloss, loadloss, tap, conn_num in group(two_ph_rows):
+            commands[pos] = (f"new transformer.mv_f0_lv_{sub_id} "
+                             f"phases=1 "
+                             f"windings=3 "
+                             f"buses=[mv_f0_n{bus1}.{conn_num} mv_f0_lv{index}_busbar.1.0 mv_f0_lv{index}_busbar.0.2] "
+                             f"conns=[Delta Wye Wye] "
+                             f"kVs=[22 0.25 0.25] "
+                             f"kVAs=[{kva1} {kva2} {kva2}] "
+                             f"xhl={xhl} "
+                             f"%noloadloss={noloadloss} "
+                             f"%loadloss={loadloss} "
+                             f"wdg=1 "
+                             f"numtaps=4 "
+                             f"tap={tap} "
+                             f"maxtap=1.137 "
+                             f"mintap=1.028")
+        progress.update(len(two_ph_rows))
+        
+        # Single-phase (SWER) transformers
+        for pos, index, sub_id, bus1, conn1, conn2, kv1, kv2, kva1, kva2, xhl, noloadloss, loadloss, tap, conn_num in group(one_ph_rows):
+            commands[pos] = (f"new transformer.mv_f0_lv_{sub_id} "
+                             f"phases=1 "
+                             f"windings=2 "
+                             f"buses=[mv_f0_n{bus1}.{conn_num} mv_f0_lv{index}_busbar.1] "
+                             f"conns=[Wye Wye] "
+                             f"kVs=[{kv1} {kv2}] "
+                             f"kVAs=[{kva1} {kva2}] "
+                             f"xhl={xhl} "
+                             f"%noloadloss={noloadloss} "
+                             f"%loadloss={loadloss} "
+                             f"wdg=1 "
+                             f"numtaps=4 "
+                             f"tap={tap} "
+                             f"maxtap=1.137 "
+                             f"mintap=1.028")
+        progress.update(len(one_ph_rows))
+        progress.close()
+        
+        self.send_commands(commands)
+        
+        # OpenDSS names of the transformers (aligned on the index of the rows of 'lvtx')
+        self.gis_data["MVLV_txs"]["DSSNAME"] = "mv_f0_lv_" + element["Substation_ID"].astype(str)
 
     def lv_nets(self):
         element = self.data["lv_lines"]
-        for index, row in tqdm(element.iterrows(), desc="Building the circuit - LV Lines         : ", total=len(element)):
-            if row['phases'] == 3:   
-                bus_conn = ".1.2.3"
-            else:
-                bus_conn = ".1"
-                
-            line_data = (f"new line.{row['line_name']} "
-                         f"bus1={row['bus1']}{bus_conn} "
-                         f"bus2={row['bus2']}{bus_conn} "
-                         f"phases={row['phases']} "
-                         f"length={row['length']} "
-                         f"units={row['units']} "
-                         f"linecode={row['linecode']} ")
-            # print(line_data)
-            self.dss_text.Command = line_data
-
-    def lv_load_mod(self, selected_day=0):
+        # Nodes of the buses: three-phase lines or single-phase lines
+        bus_conns = np.where(element["phases"].to_numpy() == 3, ".1.2.3", ".1")
+        columns = _str_columns(element, ["line_name", "bus1", "bus2", "phases", "length", "units", "linecode"])
+        commands = [(f"new line.{line_name} "
+                     f"bus1={bus1}{bus_conn} "
+                     f"bus2={bus2}{bus_conn} "
+                     f"phases={phases} "
+                     f"length={length} "
+                     f"units={units} "
+                     f"linecode={linecode} ")
+                    for bus_conn, line_name, bus1, bus2, phases, length, units, linecode in tqdm(zip(bus_conns, *columns), desc="Building the circuit - LV Lines         : ", total=len(element))]
+        self.send_commands(commands)
+
+    def load_profiles(self):
+        """
+        Residential and non-residential demand profiles (.npy files in the working directory, checked by 'check_data').
+        The files are memory-mapped, so only the profiles used are read from disk.
+        """
+        profile_location = Path(os.getcwd())
+        return (np.load(profile_location / "Res_load_data_30min_res.npy", mmap_mode="r"),
+                np.load(profile_location / "Com_load_data_30min_res.npy", mmap_mode="r"))
+
+    def lv_load_mod(self, selected_day=0, seed=100):
         # Loadshape initial settings
-        profile_locataion = f"{os.getcwd()}"
-        house_data = np.load(f"{profile_locataion}\Res_load_data_30min_res.npy")
-        com_data = np.load(f"{profile_locataion}\Com_load_data_30min_res.npy")
+        house_data, com_data = self.load_profiles()
         time_res = 30
+        # Seeded generator, so the same day and load allocation are obtained every time (for any selected day)
+        rng = np.random.default_rng(seed)
         if selected_day==0:
-            np.random.seed(100)
-            selected_day = int(np.random.randint(0, 365))
-        else:
-            selected_day = selected_day
+            selected_day = int(rng.integers(0, 365))
+        
+        # Peak demand of each non-residential profile on the selected day (computed once for all the customers)
+        com_day_max = com_data[:, selected_day, :].max(axis=1)
         
         # Load definition
         element = self.data["lv_loads"]
-        for index, row in tqdm(element.iterrows(), desc="Building the circuit - Customer loadings: ", total=len(element)):
+        # Random draws for all the customers at once: a residential profile and a position among the non-residential candidates
+        house_pick = rng.integers(0, len(house_data), size=len(element))
+        com_pick = rng.random(size=len(element))
+        # Non-residential profiles peaking below half of the transformer capacity, found once per capacity value
+        # (customers fed by transformers of the same size share the same candidates)
+        load_phases = element["phases"].to_numpy()
+        is_com = load_phases != 1
+        com_caps, com_cap_group = np.unique(element["tx_cap"].to_numpy()[is_com], return_inverse=True)
+        com_candidates = [np.flatnonzero(com_day_max < tx_cap/2) for tx_cap in com_caps]
+        cap_group = np.full(len(element), -1)
+        cap_group[is_com] = com_cap_group
+        # The load definitions are the same for residential (single-phase) and non-residential customers
+        columns = _str_columns(element, ["load_name", "phases", "bus1", "kv", "pf", "model"])
+        load_commands = [(f"new load.{load_name} "
+                          f"phases={phases} "
+                          f"bus1={bus1} "
+                          f"kw=1 "
+                          f"conn=wye " 
+                          f"kv={kv} "
+                          f"pf={pf} "
+                          f"model=1 "
+                          f"vminpu=0.0 vmaxpu=2 "
+                          f"status={model} "
+                          f"enabled=True")
+                         for load_name, phases, bus1, kv, pf, model in zip(*columns)]
+        
+        # Loads, loadshapes and their association (load.<name>.daily=<loadshape>) are sent to OpenDSS as one batch
+        commands = []
+        
+        for index, load_name, phases, group, load_data, house_id, com_u in tqdm(zip(element.index, columns[0], load_phases, cap_group, load_commands, house_pick, com_pick),
+                                                               desc="Building the circuit - Customer loadings: ", total=len(element)):
                     
-            if row['phases'] == 1:
-                
-                load_data = (f"new load.{row['load_name']} "
-                              f"phases={row['phases']} "
-                              f"bus1={row['bus1']} "
-                              f"kw=1 "
-                              f"conn=wye " 
-                              f"kv={row['kv']} "
-                              f"pf={row['pf']} "
-                              f"model=1 "
-                              f"vminpu=0.0 vmaxpu=2 "
-                              f"status={row['model']} "
-                              f"enabled=True")
+            if phases == 1:
                 
-                self.dss_text.Command = load_data
+                commands.append(load_data)
 
-                load_profile_res = house_data[np.random.randint(len(house_data)), selected_day, :]
+                load_profile_res = house_data[house_id, selected_day, :]
                 load_shape = (f'New Loadshape.Load_shape_res_{index} '
                               f'npts={int((24 * 60) / time_res)} '
                               f'minterval={time_res} '
                               f'Pmult={load_profile_res.tolist()} '
                               f'useactual=no')
-                self.dss_text.Command = load_shape
-                
-                # Then, associate the profile to a customer
-                self.dss_circuit.SetActiveElement(f"load.{row['load_name']}")
-                self.dss_circuit.ActiveElement.Properties('daily').Val = f"Load_shape_res_{index}"
+                commands.append(load_shape)
+                commands.append(f"load.{load_name}.daily=Load_shape_res_{index}")
                 
 
             else:
-                load_data = (f"new load.{row['load_name']} "
-                              f"phases={row['phases']} "
-                              f"bus1={row['bus1']} "
-                              f"kw=1 "
-                              f"conn=wye " 
-                              f"kv={row['kv']} "
-                              f"pf={row['pf']} "
-                              f"model=1 "
-                              f"vminpu=0.0 vmaxpu=2 "
-                              f"status={row['model']} "
-                              f"enabled=True")
-        
-                self.dss_text.Command = load_data
+                commands.append(load_data)
                 
-                while True:
+                # Random profile among those peaking below half of the transformer capacity (any profile if there is none)
+                candidates = com_candidates[group]
+                if candidates.size:
+                    profile_id = candidates[int(com_u*candidates.size)]
+                else:
+                    profile_id = int(com_u*len(com_data))
                 
-                    load_profile_com = com_data[np.random.randint(len(com_data)), selected_day, :]
-                    load_av = np.mean(load_profile_com)
-                    load_max = np.max(load_profile_com)
-                    
-                    if load_max < row['tx_cap']/2:
-                        break
+                load_profile_com = com_data[profile_id, selected_day, :]
                 
                 load_shape = (f'New Loadshape.Load_shape_com_{index} '
                               f'npts={int((24 * 60) / time_res)} '
                               f'minterval={time_res} '
                               f'Pmult={load_profile_com.tolist()} '
                               f'useactual=no')
-                self.dss_text.Command = load_shape
-                
-                # Then, associate the profile to a customer
-                self.dss_circuit.SetActiveElement(f"load.{row['load_name']}")
-                self.dss_circuit.ActiveElement.Properties('daily').Val = f"Load_shape_com_{index}"
+                commands.append(load_shape)
+                commands.append(f"load.{load_name}.daily=Load_shape_com_{index}")
+        
+        self.send_commands(commands)
         
         return selected_day
         
@@ -864,32 +1113,22 @@ class DSSDriver:
     def Voltge_profile_plot(self):
         plt.rcParams["font.size"] = 18
     
-        nodes = list(self.temp_all_V_values.index)
-    
-        mv_nodes = {phase: [] for phase in ['1', '2', '3']}
-        lv_nodes = {phase: [] for phase in ['1', '2', '3']}
+        vals = self.temp_all_V_values['Val'].to_numpy(dtype=float)
+        dists = self.temp_all_V_values['Distance'].to_numpy(dtype=float)
     
-        for node in nodes:
-            node_str = str(node).lower()
-            if ("mv" in node_str and "lv" not in node_str) or "source" in node_str:
-                phase = node_str[-1]
-                mv_nodes[phase].append(node)
-            elif "lv" in node_str:
-                phase = node_str[-1]
-                lv_nodes[phase].append(node)
+        # Classification of the nodes by voltage level and phase (the last character of the node name)
+        node_names = self.temp_all_V_values.index.astype(str).str.lower()
+        node_phases = np.asarray(node_names.str[-1])
+        is_lv = np.asarray(node_names.str.contains("lv", regex=False), dtype=bool)
+        is_mv = np.asarray(node_names.str.contains("mv", regex=False), dtype=bool) & ~is_lv
+        is_mv |= np.asarray(node_names.str.contains("source", regex=False), dtype=bool)
+        is_lv = is_lv & ~is_mv
     
-        V_mv = {phase: pd.DataFrame(index=mv_nodes[phase], columns=['Val', 'Distance']) for phase in ['1', '2', '3']}
-        V_lv = {phase: pd.DataFrame(index=lv_nodes[phase], columns=['Val', 'Distance']) for phase in ['1', '2', '3']}
+        # LV nodes with (almost) no voltage are not plotted
+        has_voltage = vals > 0.1
     
-        for node in list(self.temp_all_V_values.index):
-            phase = str(node)[-1]
-            if node in mv_nodes[phase]:
-                V_mv[phase].loc[node, 'Val'] = self.temp_all_V_values.loc[node, 'Val']
-                V_mv[phase].loc[node, 'Distance'] = self.temp_all_V_values.loc[node, 'Distance']
-            elif node in lv_nodes[phase]:
-                if self.temp_all_V_values.loc[node, 'Val'] > 0.1:
-                    V_lv[phase].loc[node, 'Val'] = self.temp_all_V_values.loc[node, 'Val']
-                    V_lv[phase].loc[node, 'Distance'] = self.temp_all_V_values.loc[node, 'Distance']
+        mv_masks = {phase: is_mv & (node_phases == phase) for phase in ['1', '2', '3']}
+        lv_masks = {phase: is_lv & (node_phases == phase) for phase in ['1', '2', '3']}
     
         # PLOT
         legend = []
@@ -900,11 +1139,14 @@ class DSSDriver:
                    '3': {'mv': 'bo', 'lv': 'b.'}}
     
         for phase in ['1', '2', '3']:
-            if not V_mv[phase].empty:
-                plt.plot(V_mv[phase]['Distance'], V_mv[phase]['Val'], markers[phase]['mv'], markersize=3.5)
+            mv_mask = mv_masks[phase]
+            if mv_mask.any():
+                plt.plot(dists[mv_mask], vals[mv_mask], markers[phase]['mv'], markersize=3.5)
                 legend.append(f"MV phase {phase}")
-            if not V_lv[phase].empty:
-                plt.plot(V_lv[phase]['Distance'], V_lv[phase]['Val'], markers[phase]['lv'], markersize=2.5)
+            lv_mask = lv_masks[phase]
+            if lv_mask.any():
+                lv_mask = lv_mask & has_voltage
+                plt.plot(dists[lv_mask], vals[lv_mask], markers[phase]['lv'], markersize=2.5)
                 legend.append(f"LV phase {phase}")
     
         ax1.grid(color='grey', linestyle='-', linewidth=0.2)
@@ -918,11 +1160,7 @@ class DSSDriver:
         
         # Explanation
         
-        n_reg_txs = 0
-        try:
-            n_reg_txs = self.data['mvtx']["Substation_ID"].str.contains('_REG').sum()
-        except:
-            pass
+        n_reg_txs = _mvtx_kinds(self.data.get('mvtx'))[0].sum()
         
         if n_reg_txs > 0:
             print("This circuit has voltage regulators. These are devices typically used on long distribution networks with the aim of raising the voltage levels on zones far from the source. These regulators are essentially autotransformers with a control on the tap positions, which will act according to the settings of the control. In this case, the settings on the voltage regulators are working to maintain a voltage of 1.00 pu (22 kV line to line) at the secondary side, explaining why there are some gaps between the MV points on the voltage profile plot.")
@@ -935,13 +1173,13 @@ class DSSDriver:
 
         fig, axes = plt.subplots(dpi=300, figsize=(16, 6))  # Adjust figsize as needed
 
-        for column in self.Vdata.columns:
-            axes.plot(idx_date, self.Vdata[column], color='blue', alpha=0.2)
-            axes.xaxis.set_major_locator(hours)
-            axes.xaxis.set_major_formatter(h_fmt)
-            axes.set_xlabel('Time of the day')
-            axes.set_ylabel('Voltages [V]')
-            axes.grid(color='grey', linestyle='-', linewidth=0.2)
+        # One line per customer (the columns of Vdata), drawn with a single call
+        axes.plot(idx_date, self.Vdata.to_numpy(dtype=float), color='blue', alpha=0.2)
+        axes.xaxis.set_major_locator(hours)
+        axes.xaxis.set_major_formatter(h_fmt)
+        axes.set_xlabel('Time of the day')
+        axes.set_ylabel('Voltages [V]')
+        axes.grid(color='grey', linestyle='-', linewidth=0.2)
         axes.axhline(y=253, color='red', linestyle='--')
         # Adjust layout and show the plot
         legend_elements = [
@@ -959,7 +1197,14 @@ class DSSDriver:
         hours = mdates.HourLocator(interval = 4)
         h_fmt = mdates.DateFormatter('%H:%M')
         
-        if (self.data["lvtx"]["Conn_Type"].str.len() == 3).all():
+        # Utilisation of the MV/LV transformers (one column per transformer)
+        lvtx = self.data["lvtx"]
+        tx_utilisation = 100*self.Sdata_txs.to_numpy(dtype=float)/lvtx["kvas_primary"].to_numpy(dtype=float)
+        # Masks of the transformer types and connections (computed once, used to select the columns to plot)
+        is_res = lvtx["Type"].to_numpy() == "RES"
+        is_3ph = lvtx["Conn_Type"].str.len().to_numpy() == 3
+        
+        if is_3ph.all():
             
             fig, axes = plt.subplots(dpi=300, figsize=(16, 6))  # Adjust figsize as needed
             
@@ -967,14 +1212,9 @@ class DSSDriver:
             tx_cap = self.data["mv_net_txs"].loc[0, "kvas_primary"]
             axes.plot(idx_date, 100*self.Sdata["Value"]/tx_cap, color="blue", zorder=3, linewidth=3.5)
             
-            # MV/LV transformers
-            for i, column in enumerate(self.Sdata_txs.columns):
-                tx_cap =  self.data["lvtx"].loc[i, "kvas_primary"]
-                tx_type = self.data["lvtx"].loc[i, "Type"]
-                if tx_type == "RES":
-                    axes.plot(idx_date, 100*self.Sdata_txs[column]/tx_cap, color="silver", zorder=1)
-                else:
-                    axes.plot(idx_date, 100*self.Sdata_txs[column]/tx_cap, color="black", zorder=2)
+            # MV/LV transformers (one call per type)
+            axes.plot(idx_date, tx_utilisation[:, is_res], color="silver", zorder=1)
+            axes.plot(idx_date, tx_utilisation[:, ~is_res], color="black", zorder=2)
             axes.xaxis.set_major_locator(hours)
             axes.xaxis.set_major_formatter(h_fmt)
             axes.set_xlabel('Time of the day')
@@ -1004,19 +1244,10 @@ class DSSDriver:
             tx_cap = self.data["mv_net_txs"].loc[0, "kvas_primary"]
             axes.plot(idx_date, 100*self.Sdata["Value"]/tx_cap, color="blue", zorder=4, linewidth=3.5)
             
-            # MV/LV transformers
-            for i, column in enumerate(self.Sdata_txs.columns):
-                tx_cap =  self.data["lvtx"].loc[i, "kvas_primary"]
-                tx_type = self.data["lvtx"].loc[i, "Type"]
-                tx_conn = self.data["lvtx"].loc[i, "Conn_Type"]
-                
-                if tx_type == "RES":
-                    if len(tx_conn) == 3:
-                        axes.plot(idx_date, 100*self.Sdata_txs[column]/tx_cap, color="darkgrey", zorder=1)
-                    else:
-                        axes.plot(idx_date, 100*self.Sdata_txs[column]/tx_cap, color="sandybrown", zorder=2)
-                else:
-                    axes.plot(idx_date, 100*self.Sdata_txs[column]/tx_cap, color="black", zorder=3)
+            # MV/LV transformers (one call per type and connection)
+            axes.plot(idx_date, tx_utilisation[:, is_res & is_3ph], color="darkgrey", zorder=1)
+            axes.plot(idx_date, tx_utilisation[:, is_res & ~is_3ph], color="sandybrown", zorder=2)
+            axes.plot(idx_date, tx_utilisation[:, ~is_res], color="black", zorder=3)
             
             axes.xaxis.set_major_locator(hours)
             axes.xaxis.set_major_formatter(h_fmt)
@@ -1041,134 +1272,98 @@ class DSSDriver:
             plt.show()
             
     
-    def gis_tx_utilisation(self):
-            
-        utilisation_pct = 100*self.gis_data["MVLV_txs"]["SNAP_val"]/self.gis_data["MVLV_txs"]["kvas_primary"]
-        self.gis_data["MVLV_txs"]['Ut_pct'] = utilisation_pct
-
-        # Plot
-        fig, ax = plt.subplots(figsize=(8, 8), dpi=300)
-        
-        # Plot the GeoDataFrames
-        self.gis_data["MV_tx"].plot(ax=ax, color="black", alpha=0.7, marker="^", markersize=256, label='MV tx', zorder=1)
-        self.gis_data["MV_lines"].plot(ax=ax, color="grey", alpha=0.7, label='MV Lines', zorder=2, linewidth=2.5)
-        self.gis_data["MVLV_txs"].plot(column='Ut_pct', ax=ax, cmap='RdYlGn_r', markersize=16, vmin=0, vmax=100)
+    def gis_coordinates(self, layer):
+        """
+        Coordinates of the geometries of a GIS layer: an (N, 2) array for points, or the list of (n_vertices, 2) arrays
+        of the lines.
+        """
+        geometries = self.gis_data[layer].geometry.values
+        coords = shapely.get_coordinates(geometries)
+        if self.gis_data[layer].geom_type.eq("LineString").all():
+            coords = np.split(coords, np.cumsum(shapely.get_num_coordinates(geometries))[:-1])
         
-        # Create color bar using a color map
-        mappable = plt.cm.ScalarMappable(cmap='RdYlGn_r')
-        mappable.set_array(range(101))
-        cbar = fig.colorbar(mappable, ax=ax, shrink=0.5)  # Adjust 'shrink' as needed
-        cbar.set_label('Tx Utilisation [%]', fontsize=10)
-        cbar.set_ticks([0, 20, 40, 60, 80, 100])
-        cbar.ax.set_yticklabels(['0', '20', '40', '60', '80', '100'], fontsize=10)
-        
-        for label in (ax.get_xticklabels() + ax.get_yticklabels()):
-            label.set_fontsize(10)
-
-        ax.title.set_fontsize(10)
-        ax.xaxis.label.set_fontsize(10)
-        ax.yaxis.label.set_fontsize(10)
+        return coords
+
+    def gis_scatter(self, ax, layer, values, **kwargs):
+        """
+        Plot the points of a GIS layer coloured by 'values' with a single scatter (points without a value are not plotted).
+        """
+        values = np.asarray(values, dtype=float)
+        has_value = ~np.isnan(values)
+        xy = self.gis_coordinates(layer)[has_value]
+        return ax.scatter(xy[:, 0], xy[:, 1], c=values[has_value], **kwargs)
+
+    def gis_line_collection(self, ax, layer, values, cmap, vmin, vmax, **kwargs):
+        """
+        Plot the lines of a GIS layer coloured by 'values' as a single LineCollection (lines without a value are not plotted).
+        """
+        values = np.asarray(values, dtype=float)
+        has_value = ~np.isnan(values)
+        segments = self.gis_coordinates(layer)
+        collection = LineCollection([segments[i] for i in np.flatnonzero(has_value)], **kwargs)
+        collection.set_array(values[has_value])
+        collection.set_cmap(cmap)
+        collection.set_clim(vmin, vmax)
+        ax.add_collection(collection, autolim=True)
+        ax.autoscale_view()
+        return collection
+
+    def _gis_util_plot(self, layer_key, val_col, cap_col, ut_col, cbar_label, tight_layout=True, zorder=None):
+        """
+        Shared GIS utilisation map: colours the 'MVLV_txs' points or the 'MV_lines' lines by val_col/cap_col [%]
+        (stored in ut_col), with the other layers drawn in the background. 'zorder' is the drawing order of the coloured
+        points or lines (by default, 1 for the points and 3 for the lines).
+        """
+        layer = self.gis_data[layer_key]
+        utilisation_pct = 100*layer[val_col]/layer[cap_col]
+        layer[ut_col] = utilisation_pct
 
-        ax.set_xticks([])
-        ax.set_yticks([])
-        plt.tight_layout()
-        plt.show()
-    
-    def gis_lines_utilisation(self):
-        
-        utilisation_pct = 100*self.gis_data["MV_lines"]["SNAP_val"]/self.gis_data["MV_lines"]["Ampacity"]
-        self.gis_data["MV_lines"]['Ut_pct'] = utilisation_pct
-        # Create a figure and axis
-        fig, ax = plt.subplots(figsize=(8, 8), dpi=300)
-        
-        # Plot the GeoDataFrames
-        self.gis_data["MV_tx"].plot(ax=ax, color="black", alpha=0.7, marker="^", markersize=256, label='MV tx', zorder=1)
-        self.gis_data["MVLV_txs"].plot(ax=ax, color="grey", alpha=1, marker="o", markersize=16, label='LV txs', zorder=3)
-        self.gis_data["MV_lines"].plot(column='Ut_pct', ax=ax, cmap='RdYlGn_r', linewidth=2.5, markersize=64, vmin=0, vmax=100, zorder=3)
-        
-        # Create color bar using a color map
-        mappable = plt.cm.ScalarMappable(cmap='RdYlGn_r')
-        mappable.set_array(range(101))
-        cbar = fig.colorbar(mappable, ax=ax, shrink=0.5)  # Adjust 'shrink' as needed
-        cbar.set_label('Line Utilisation [%]', fontsize=10)
-        cbar.set_ticks([0, 20, 40, 60, 80, 100])
-        cbar.ax.set_yticklabels(['0', '20', '40', '60', '80', '100'], fontsize=10)
-        
-        for label in (ax.get_xticklabels() + ax.get_yticklabels()):
-            label.set_fontsize(10)
-
-        ax.title.set_fontsize(10)
-        ax.xaxis.label.set_fontsize(10)
-        ax.yaxis.label.set_fontsize(10)
-        
-        ax.set_xticks([])
-        ax.set_yticks([])
-        plt.tight_layout()
-        plt.show()
-
-    def gis_tx_utilisation_daily(self):
-
-        utilisation_pct = 100*self.gis_data["MVLV_txs"]["DAILY_max"]/self.gis_data["MVLV_txs"]["kvas_primary"]
-        self.gis_data["MVLV_txs"]['Ut_max'] = utilisation_pct
         # Create a figure and axis
         fig, ax = plt.subplots(figsize=(8, 8), dpi=300)
 
         # Plot the GeoDataFrames
         self.gis_data["MV_tx"].plot(ax=ax, color="black", alpha=0.7, marker="^", markersize=256, label='MV tx', zorder=1)
-        self.gis_data["MV_lines"].plot(ax=ax, color="grey", alpha=0.7, label='MV Lines', zorder=2, linewidth=2.5)
-        self.gis_data["MVLV_txs"].plot(column='Ut_max', ax=ax, cmap='RdYlGn_r', markersize=16, zorder=3, vmin=0, vmax=100)
+        if layer_key == "MVLV_txs":
+            self.gis_data["MV_lines"].plot(ax=ax, color="grey", alpha=0.7, label='MV Lines', zorder=2, linewidth=2.5)
+            self.gis_scatter(ax, layer_key, utilisation_pct, cmap='RdYlGn_r', s=16, marker="o", vmin=0, vmax=100,
+                             zorder=1 if zorder is None else zorder)
+        else:
+            self.gis_data["MVLV_txs"].plot(ax=ax, color="grey", alpha=1, marker="o", markersize=16, label='LV txs', zorder=3)
+            self.gis_line_collection(ax, layer_key, utilisation_pct, cmap='RdYlGn_r', vmin=0, vmax=100, linewidth=2.5,
+                                     zorder=3 if zorder is None else zorder)
 
         # Create color bar using a color map
         mappable = plt.cm.ScalarMappable(cmap='RdYlGn_r')
-        mappable.set_array(range(101))
+        mappable.set_clim(0, 100)
         cbar = fig.colorbar(mappable, ax=ax, shrink=0.5)  # Adjust 'shrink' as needed
-        cbar.set_label('Max Tx Utilisation [%]', fontsize=10)
+        cbar.set_label(cbar_label, fontsize=10)
         cbar.set_ticks([0, 20, 40, 60, 80, 100])
         cbar.ax.set_yticklabels(['0', '20', '40', '60', '80', '100'], fontsize=10)
-        
+
         for label in (ax.get_xticklabels() + ax.get_yticklabels()):
             label.set_fontsize(10)
 
         ax.title.set_fontsize(10)
         ax.xaxis.label.set_fontsize(10)
         ax.yaxis.label.set_fontsize(10)
-        
+
         ax.set_xticks([])
         ax.set_yticks([])
-
+        if tight_layout:
+            plt.tight_layout()
         plt.show()
 
-    def gis_lines_utilisation_daily(self):
-
-        utilisation_pct = 100*self.gis_data["MV_lines"]["DAILY_max"]/self.gis_data["MV_lines"]["Ampacity"]
-        self.gis_data["MV_lines"]['Ut_max'] = utilisation_pct
-        # Create a figure and axis
-        fig, ax = plt.subplots(figsize=(8, 8), dpi=300)
-
-        # Plot the GeoDataFrames
-        self.gis_data["MV_tx"].plot(ax=ax, color="black", alpha=0.7, marker="^", markersize=256, label='MV tx', zorder=1)
-        self.gis_data["MVLV_txs"].plot(ax=ax, color="grey", alpha=1, marker="o", markersize=16, label='LV txs', zorder=3)
-        self.gis_data["MV_lines"].plot(column='Ut_max', ax=ax, cmap='RdYlGn_r', linewidth=2.5, markersize=64, vmin=0, vmax=100, zorder=3)
-
-        # Create color bar using a color map
-        mappable = plt.cm.ScalarMappable(cmap='RdYlGn_r')
-        mappable.set_array(range(101))
-        cbar = fig.colorbar(mappable, ax=ax, shrink=0.5)  # Adjust 'shrink' as needed
-        cbar.set_label('Max Line Utilisation [%]', fontsize=10)
-        cbar.set_ticks([0, 20, 40, 60, 80, 100])
-        cbar.ax.set_yticklabels(['0', '20', '40', '60', '80', '100'], fontsize=10)
-        
-        for label in (ax.get_xticklabels() + ax.get_yticklabels()):
-            label.set_fontsize(10)
+    def gis_tx_utilisation(self):
+        self._gis_util_plot("MVLV_txs", "SNAP_val", "kvas_primary", 'Ut_pct', 'Tx Utilisation [%]')
 
-        ax.title.set_fontsize(10)
-        ax.xaxis.label.set_fontsize(10)
-        ax.yaxis.label.set_fontsize(10)
+    def gis_lines_utilisation(self):
+        self._gis_util_plot("MV_lines", "SNAP_val", "Ampacity", 'Ut_pct', 'Line Utilisation [%]')
 
-        ax.set_xticks([])
-        ax.set_yticks([])
+    def gis_tx_utilisation_daily(self):
+        self._gis_util_plot("MVLV_txs", "DAILY_max", "kvas_primary", 'Ut_max', 'Max Tx Utilisation [%]', tight_layout=False, zorder=3)
 
-        plt.show()
+    def gis_lines_utilisation_daily(self):
+        self._gis_util_plot("MV_lines", "DAILY_max", "Ampacity", 'Ut_max', 'Max Line Utilisation [%]', tight_layout=False)
         
 
     